@@ -1,116 +1,178 @@
 import os
+import asyncio
 import traceback
-from flask import Flask, request, jsonify
-from flasgger import Swagger, swag_from
+from functools import lru_cache
+from quart import Quart, request, jsonify
+from quart_schema import QuartSchema, document_request, document_response, tag
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from langchain_openai import OpenAI
-from crewai import Agent, Task, Crew
+from crewai import Agent, Task, Crew, LLM
+from llm_cache import LLMCache, SingleFlight
+from json_provider import ORJSONProvider
+from http_clients import share_with_litellm
+from compression import compress_responses
+from smart_answers import normalize_input, mentions_skillcapital, get_smart_answer, SKILLCAPITAL_LINK_ANSWER, GENERAL_QUESTION_ANSWER, FALLBACK_ANSWER
 
 # Load .env variables (like OPENAI_API_KEY)
 load_dotenv()
 
-# Initialize Flask app and Swagger docs
-app = Flask(__name__)
-swagger = Swagger(app)
-
-# Initialize OpenAI LLM (ensure key is set in env)
-llm = OpenAI(
-    temperature=0.6,
-    model_name="gpt-4"  # Or "gpt-3.5-turbo"
-)
-
-# Define Agents
-researcher = Agent(
-    role="AI Researcher",
-    goal="Collect accurate and concise research data",
-    backstory="Expert in fact-checking and deep research.",
-    verbose=False,
-    allow_delegation=False,
-    llm=llm
-)
-
-explainer = Agent(
-    role="Insight Generator",
-    goal="Summarize and format data into bullet points with markdown and emojis",
-    backstory="Specialist in transforming technical info into engaging summaries.",
-    verbose=False,
-    allow_delegation=False,
-    llm=llm
-)
+# Share one pooled HTTP client across all OpenAI calls
+share_with_litellm()
+
+# Initialize Quart app and OpenAPI docs
+app = Quart(__name__)
+schema = QuartSchema(app)
+# Installed after QuartSchema, which sets its own provider in init_app
+app.json = ORJSONProvider(app)
+compress_responses(app)
+
+# Initialize OpenAI LLMs (ensure key is set in env)
+# CrewAI's LLM class forwards service_tier to the API
+# Fact gathering runs on a smaller, faster model; the final answer on gpt-4o
+RESEARCHER_MODEL = "gpt-4o-mini"
+EXPLAINER_MODEL = "gpt-4o"
+# Seconds before an OpenAI call is abandoned; unlike crewai's
+# max_execution_time this actually cuts a slow call short
+LLM_TIMEOUT = 15
+
+# LLM clients are built on the first /chat request, not at import
+@lru_cache(maxsize=1)
+def _get_llms():
+    researcher_llm = LLM(
+        model=RESEARCHER_MODEL,
+        temperature=0.3,
+        max_tokens=400,
+        timeout=LLM_TIMEOUT,
+        service_tier=os.getenv("OPENAI_SERVICE_TIER", "priority")
+    )
+    explainer_llm = LLM(
+        model=EXPLAINER_MODEL,
+        temperature=0.6,
+        max_tokens=400,
+        timeout=LLM_TIMEOUT,
+        service_tier=os.getenv("OPENAI_SERVICE_TIER", "priority")
+    )
+    return researcher_llm, explainer_llm
+
+# Agents are built per request: each one keeps its executor (and its message
+# history) on itself, so sharing them would mix concurrent users' prompts
+def _build_agents():
+    researcher_llm, explainer_llm = _get_llms()
+
+    # Bound each agent's reasoning loop so one question cannot run away
+    researcher = Agent(
+        role="AI Researcher",
+        goal="Collect accurate and concise research data",
+        backstory="Expert in fact-checking and deep research.",
+        verbose=False,
+        allow_delegation=False,
+        max_iter=2,
+        llm=researcher_llm
+    )
+
+    explainer = Agent(
+        role="Insight Generator",
+        goal="Summarize and format data into bullet points with markdown and emojis",
+        backstory="Specialist in transforming technical info into engaging summaries.",
+        verbose=False,
+        allow_delegation=False,
+        max_iter=2,
+        llm=explainer_llm
+    )
+
+    return {"researcher": researcher, "explainer": explainer}
+
+# Response cache (exact + semantic) checked before running the crew
+response_cache = LLMCache(model=EXPLAINER_MODEL)
+
+# Identical questions arriving while one is being answered share its crew run
+inflight = SingleFlight()
+
+# Deterministic SkillCapital FAQ answers that skip the crew entirely
+_NON_INTENT_ANSWERS = {SKILLCAPITAL_LINK_ANSWER, GENERAL_QUESTION_ANSWER, FALLBACK_ANSWER}
+
+def try_fast_answer(query: str):
+    """Return the rule-based answer for a SkillCapital intent question, else None"""
+    normalized = normalize_input(query)
+    # Topic words alone ('how long', 'cost', 'python') also appear in general
+    # questions, which belong to the crew
+    if not mentions_skillcapital(normalized):
+        return None
+    answer = get_smart_answer(normalized)
+    return None if answer in _NON_INTENT_ANSWERS else answer
 
 # CrewAI Logic
-def run_crew_chatbot_pipeline(query: str) -> str:
+async def run_crew_chatbot_pipeline(query: str) -> str:
+    cached, embedding = await asyncio.to_thread(response_cache.lookup, query)
+    if cached is not None:
+        return cached
+
+    agents = _build_agents()
+
     research_task = Task(
-        description=f"Research this question thoroughly: '{query}'",
+        description="Research this question thoroughly: '{query}'",
         expected_output="Bullet points with facts, examples, and clarity",
-        agent=researcher
+        agent=agents["researcher"]
     )
 
     explanation_task = Task(
-        description=f"Use the above research to create a concise, markdown-formatted response with bullet points and emojis.",
+        description="Use the above research to create a concise, markdown-formatted response with bullet points and emojis.",
         expected_output=(
             "• Use bullet points\n"
             "• Make it markdown formatted\n"
             "• Include emojis to highlight key facts\n"
             "• Focus on clarity and engagement"
         ),
-        agent=explainer,
+        agent=agents["explainer"],
         context=[research_task]
     )
 
     crew = Crew(
-        agents=[researcher, explainer],
+        agents=[agents["researcher"], agents["explainer"]],
         tasks=[research_task, explanation_task],
         verbose=True,
         async_execution=True,
         max_rpm=100  # Throttle if needed
     )
 
-    result = crew.kickoff()
-    return result.output.strip() if hasattr(result, "output") else str(result).strip()
+    result = await crew.kickoff_async(inputs={"query": query})
+    response = result.output.strip() if hasattr(result, "output") else str(result).strip()
+    response_cache.store(query, response, embedding)
+    return response
+
+# Request / response schemas for the OpenAPI docs
+class ChatRequest(BaseModel):
+    message: str = Field(examples=["How does quantum computing affect cybersecurity?"])
+
+class ChatResponse(BaseModel):
+    response: str
 
-# Flask API Endpoint
+class ErrorResponse(BaseModel):
+    error: str
+
+# Quart API Endpoint
 @app.route('/chat', methods=['POST'])
-@swag_from({
-    'tags': ['Chat'],
-    'parameters': [{
-        'name': 'body',
-        'in': 'body',
-        'required': True,
-        'schema': {
-            'type': 'object',
-            'properties': {
-                'message': {
-                    'type': 'string',
-                    'example': 'How does quantum computing affect cybersecurity?'
-                }
-            },
-            'required': ['message']
-        }
-    }],
-    'responses': {
-        200: {
-            'description': 'Formatted response',
-            'schema': {
-                'type': 'object',
-                'properties': {
-                    'response': {'type': 'string'}
-                }
-            }
-        },
-        400: {'description': 'Missing input'},
-        500: {'description': 'Internal server error'}
-    }
-})
-def chat():
-    data = request.get_json()
+@tag(['Chat'])
+@document_request(ChatRequest)
+@document_response(ChatResponse)
+@document_response(ErrorResponse, 400)
+@document_response(ErrorResponse, 500)
+async def chat():
+    data = await request.get_json()
     message = data.get("message", "").strip()
 
     if not message:
         return jsonify({"error": "Message is required"}), 400
 
+    fast_answer = await asyncio.to_thread(try_fast_answer, message)
+    if fast_answer is not None:
+        return jsonify({"response": fast_answer})
+
     try:
-        response = run_crew_chatbot_pipeline(message)
+        response = await inflight.run(
+            response_cache.key(message),
+            lambda: run_crew_chatbot_pipeline(message)
+        )
         return jsonify({"response": response})
     except Exception as e:
         error_trace = traceback.format_exc()
@@ -121,12 +183,14 @@ def chat():
 
 # Health check
 @app.route('/')
-def home():
+async def home():
     return jsonify({
         "message": "✅ CrewAI-powered chatbot is running!",
         "usage": "POST /chat",
-        "docs": "/apidocs"
+        "docs": "/docs"
     })
 
+# Production: hypercorn app:app --bind 0.0.0.0:8000 --workers 4 --worker-class asyncio
+# app.run() is only a local-development fallback (no debugger or reloader)
 if __name__ == '__main__':
-    app.run(host="0.0.0.0", port=8000, debug=True)
+    app.run(host="0.0.0.0", port=8000)
@@ -1,128 +1,186 @@
 import os
-from flask import Flask, request, jsonify
-from flasgger import Swagger, swag_from
+import asyncio
+from functools import lru_cache
+from quart import Quart, request, jsonify
+from quart_schema import QuartSchema, document_request, document_response, tag
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from langchain_openai import OpenAI
-from crewai import Agent, Task, Crew
+from crewai import Agent, Task, Crew, LLM
+from llm_cache import LLMCache, SingleFlight
+from json_provider import ORJSONProvider
+from http_clients import share_with_litellm
+from compression import compress_responses
+from smart_answers import normalize_input, mentions_skillcapital, get_smart_answer, SKILLCAPITAL_LINK_ANSWER, GENERAL_QUESTION_ANSWER, FALLBACK_ANSWER
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Flask app and Swagger
-app = Flask(__name__)
-swagger = Swagger(app)
-
-# Initialize LLM
-llm = OpenAI(
-    temperature=0.7,
-    model_name="gpt-4"  # Or "gpt-3.5-turbo"
-)
-
-# Define Researcher Agent
-researcher = Agent(
-    role="AI Researcher",
-    goal="Thoroughly research and gather factual, relevant information",
-    backstory="Expert in AI and information retrieval. Always delivers factual, reliable content.",
-    verbose=True,
-    allow_delegation=True,
-    llm=llm
-)
-
-# Define Explainer Agent
-explainer = Agent(
-    role="Response Formatter",
-    goal="Convert technical or detailed data into bullet points and clear insights",
-    backstory="A communication expert who presents data clearly using bullet points, markdown, and emojis.",
-    verbose=True,
-    allow_delegation=False,
-    llm=llm
-)
+# Share one pooled HTTP client across all OpenAI calls
+share_with_litellm()
+
+# Initialize Quart app and OpenAPI docs
+app = Quart(__name__)
+schema = QuartSchema(app)
+# Installed after QuartSchema, which sets its own provider in init_app
+app.json = ORJSONProvider(app)
+compress_responses(app)
+
+# Initialize LLMs (CrewAI's LLM class forwards service_tier to the API)
+# Fact gathering runs on a smaller, faster model; the final answer on gpt-4o
+RESEARCHER_MODEL = "gpt-4o-mini"
+EXPLAINER_MODEL = "gpt-4o"
+# Seconds before an OpenAI call is abandoned; unlike crewai's
+# max_execution_time this actually cuts a slow call short
+LLM_TIMEOUT = 15
+
+# LLM clients are built on the first /chat request, not at import
+@lru_cache(maxsize=1)
+def _get_llms():
+    researcher_llm = LLM(
+        model=RESEARCHER_MODEL,
+        temperature=0.3,
+        max_tokens=400,
+        timeout=LLM_TIMEOUT,
+        service_tier=os.getenv("OPENAI_SERVICE_TIER", "priority")
+    )
+    explainer_llm = LLM(
+        model=EXPLAINER_MODEL,
+        temperature=0.7,
+        max_tokens=400,
+        timeout=LLM_TIMEOUT,
+        service_tier=os.getenv("OPENAI_SERVICE_TIER", "priority")
+    )
+    return researcher_llm, explainer_llm
+
+# Agents are built per request: each one keeps its executor (and its message
+# history) on itself, so sharing them would mix concurrent users' prompts
+def _build_agents():
+    researcher_llm, explainer_llm = _get_llms()
+
+    # Bound each agent's reasoning loop so one question cannot run away
+    researcher = Agent(
+        role="AI Researcher",
+        goal="Thoroughly research and gather factual, relevant information",
+        backstory="Expert in AI and information retrieval. Always delivers factual, reliable content.",
+        verbose=True,
+        allow_delegation=True,
+        max_iter=2,
+        llm=researcher_llm
+    )
+
+    explainer = Agent(
+        role="Response Formatter",
+        goal="Convert technical or detailed data into bullet points and clear insights",
+        backstory="A communication expert who presents data clearly using bullet points, markdown, and emojis.",
+        verbose=True,
+        allow_delegation=False,
+        max_iter=2,
+        llm=explainer_llm
+    )
+
+    return {"researcher": researcher, "explainer": explainer}
+
+# Response cache (exact + semantic) checked before running the crew
+response_cache = LLMCache(model=EXPLAINER_MODEL)
+
+# Identical questions arriving while one is being answered share its crew run
+inflight = SingleFlight()
+
+# Deterministic SkillCapital FAQ answers that skip the crew entirely
+_NON_INTENT_ANSWERS = {SKILLCAPITAL_LINK_ANSWER, GENERAL_QUESTION_ANSWER, FALLBACK_ANSWER}
+
+def try_fast_answer(query: str):
+    """Return the rule-based answer for a SkillCapital intent question, else None"""
+    normalized = normalize_input(query)
+    # Topic words alone ('how long', 'cost', 'python') also appear in general
+    # questions, which belong to the crew
+    if not mentions_skillcapital(normalized):
+        return None
+    answer = get_smart_answer(normalized)
+    return None if answer in _NON_INTENT_ANSWERS else answer
 
 # Core function to run CrewAI task
-def run_crew_chatbot_pipeline(query: str) -> str:
+async def run_crew_chatbot_pipeline(query: str) -> str:
+    cached, embedding = await asyncio.to_thread(response_cache.lookup, query)
+    if cached is not None:
+        return cached
+
+    agents = _build_agents()
+
     # Research Task
     research_task = Task(
-        description=f"Conduct research on: '{query}' and gather key factual points.",
+        description="Conduct research on: '{query}' and gather key factual points.",
         expected_output="List detailed findings in a factual format with context and relevance.",
-        agent=researcher
+        agent=agents["researcher"]
     )
 
     # Explanation Task
     explanation_task = Task(
-        description=f"Using the research, create a clear and engaging bullet-point explanation for: '{query}'",
+        description="Using the research, create a clear and engaging bullet-point explanation for: '{query}'",
         expected_output="Respond in bullet points with markdown, use emojis if helpful, and be concise yet informative.",
-        agent=explainer,
+        agent=agents["explainer"],
         context=[research_task]  # Depends on output from researcher
     )
 
     # Crew setup
     crew = Crew(
-        agents=[researcher, explainer],
+        agents=[agents["researcher"], agents["explainer"]],
         tasks=[research_task, explanation_task],
         verbose=False
     )
 
-    result = crew.kickoff()
-    return str(result).strip()
+    result = await crew.kickoff_async(inputs={"query": query})
+    response = str(result).strip()
+    response_cache.store(query, response, embedding)
+    return response
+
+
+# Request / response schemas for the OpenAPI docs
+class ChatRequest(BaseModel):
+    message: str = Field(examples=["How does blockchain impact supply chain transparency?"])
 
+class ChatResponse(BaseModel):
+    response: str
+
+class ErrorResponse(BaseModel):
+    error: str
 
 # API Endpoint
 @app.route('/chat', methods=['POST'])
-@swag_from({
-    'tags': ['Chat'],
-    'parameters': [
-        {
-            'name': 'body',
-            'in': 'body',
-            'required': True,
-            'schema': {
-                'type': 'object',
-                'properties': {
-                    'message': {
-                        'type': 'string',
-                        'example': 'How does blockchain impact supply chain transparency?'
-                    }
-                },
-                'required': ['message']
-            }
-        }
-    ],
-    'responses': {
-        200: {
-            'description': 'Chatbot response',
-            'schema': {
-                'type': 'object',
-                'properties': {
-                    'response': {'type': 'string'}
-                }
-            }
-        },
-        400: {'description': 'Validation error'},
-        500: {'description': 'Internal server error'}
-    }
-})
-def chat():
-    data = request.get_json()
+@tag(['Chat'])
+@document_request(ChatRequest)
+@document_response(ChatResponse)
+@document_response(ErrorResponse, 400)
+@document_response(ErrorResponse, 500)
+async def chat():
+    data = await request.get_json()
     message = data.get("message", "").strip()
 
     if not message:
         return jsonify({"error": "Message is required"}), 400
 
+    fast_answer = await asyncio.to_thread(try_fast_answer, message)
+    if fast_answer is not None:
+        return jsonify({"response": fast_answer})
+
     try:
-        response = run_crew_chatbot_pipeline(message)
+        response = await inflight.run(
+            response_cache.key(message),
+            lambda: run_crew_chatbot_pipeline(message)
+        )
         return jsonify({"response": response})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # Home / Health Check
 @app.route('/')
-def home():
+async def home():
     return jsonify({
         "message": "CrewAI Multi-Agent Chatbot is live.",
         "usage": "POST /chat",
-        "docs": "/apidocs"
+        "docs": "/docs"
     })
 
-# Run
+# Run locally; in production: hypercorn bot:app --workers 4 --worker-class asyncio
 if __name__ == '__main__':
-    app.run(debug=True)
+    app.run()
@@ -13,6 +13,7 @@ if not OPENAI_API_KEY:
 
 client = OpenAI(api_key=OPENAI_API_KEY)
 MODEL_NAME = "gpt-4"
+MAX_HISTORY_MESSAGES = 20  # only the most recent turns are sent back to the model
 
 # Logging
 logging.basicConfig(filename="chat_ui.log", level=logging.INFO)
@@ -115,16 +116,11 @@ def render_message(role, content):
 for msg in st.session_state.messages:
     render_message(msg["role"], msg["content"])
 
-# Typewriter animation
-def typewriter(text, delay=0.015):
-    output = ""
-    placeholder = st.empty()
-    for char in text:
-        output += char
-        placeholder.markdown(f"`{output}`")
-        time.sleep(delay)
-    placeholder.empty()
-    return output
+# Text deltas from an OpenAI chat completion stream
+def stream_text(stream):
+    for chunk in stream:
+        if chunk.choices:
+            yield chunk.choices[0].delta.content or ""
 
 # ======================
 # Input & interaction
@@ -144,19 +140,24 @@ if user_input:
         render_message("user", user_input)
         st.session_state.messages.append({"role": "user", "content": user_input})
 
+        # Stream tokens into a placeholder as they arrive
+        placeholder = st.empty()
         try:
             with st.spinner("🤖 Thinking..."):
-                response = client.chat.completions.create(
+                stream = client.chat.completions.create(
                     model=MODEL_NAME,
-                    messages=st.session_state.messages,
-                    temperature=0.7
+                    messages=st.session_state.messages[-MAX_HISTORY_MESSAGES:],
+                    temperature=0.7,
+                    stream=True
                 )
-                reply = response.choices[0].message.content.strip()
-                logging.info(f"Bot: {reply}")
+            with placeholder.container():
+                reply = st.write_stream(stream_text(stream))
+            reply = reply.strip()
+            logging.info(f"Bot: {reply}")
         except Exception as e:
             reply = "⚠️ Something went wrong while fetching response."
             logging.exception("OpenAI error")
+        placeholder.empty()
 
-        animated_reply = typewriter(reply)
-        render_message("assistant", animated_reply)
+        render_message("assistant", reply)
         st.session_state.messages.append({"role": "assistant", "content": reply})
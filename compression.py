@@ -0,0 +1,62 @@
+import gzip
+
+import brotli
+from quart import request
+from quart.wrappers.response import DataBody
+
+# Flask-Compress only works with Flask, so the Quart apps use this small
+# equivalent; the settings mirror the Flask-Compress ones in chatbot.py.
+COMPRESS_CONFIG = {
+    "COMPRESS_MIMETYPES": ["application/json", "text/html"],
+    "COMPRESS_ALGORITHM": ["br", "gzip"],
+    "COMPRESS_MIN_SIZE": 500,
+}
+
+_ENCODERS = {
+    "br": lambda data: brotli.compress(data, quality=4),
+    "gzip": lambda data: gzip.compress(data, compresslevel=6),
+}
+
+
+def _accepted_encodings(header):
+    """Encodings the client accepts, ignoring any it refuses with q=0"""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def compress_responses(app):
+    """Register an after_request hook that br/gzip-encodes buffered Quart responses"""
+    for key, value in COMPRESS_CONFIG.items():
+        app.config.setdefault(key, value)
+
+    @app.after_request
+    async def _compress(response):
+        vary = response.headers.get("Vary")
+        if not vary:
+            response.headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            response.headers["Vary"] = f"{vary}, Accept-Encoding"
+
+        # Streamed bodies (e.g. SSE) are left alone so chunks are not held back
+        if (response.mimetype not in app.config["COMPRESS_MIMETYPES"]
+                or "Content-Encoding" in response.headers
+                or not isinstance(response.response, DataBody)
+                or not 200 <= response.status_code < 300):
+            return response
+
+        data = await response.get_data()
+        if len(data) < app.config["COMPRESS_MIN_SIZE"]:
+            return response
+
+        accepted = _accepted_encodings(request.headers.get("Accept-Encoding", ""))
+        for encoding in app.config["COMPRESS_ALGORITHM"]:
+            if encoding in accepted:
+                response.set_data(_ENCODERS[encoding](data))
+                response.headers["Content-Encoding"] = encoding
+                break
+        return response
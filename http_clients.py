@@ -0,0 +1,15 @@
+import httpx
+import litellm
+
+# One pooled HTTP/2 client of each kind per process, shared by every OpenAI
+# call so connections (DNS, TCP, TLS) are set up once and reused.
+_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=50)
+
+HTTP_CLIENT = httpx.Client(http2=True, limits=_LIMITS, timeout=30.0)
+HTTP_ASYNC_CLIENT = httpx.AsyncClient(http2=True, limits=_LIMITS, timeout=30.0)
+
+
+def share_with_litellm():
+    """Route CrewAI's LLM calls (made through litellm) over the shared clients"""
+    litellm.client_session = HTTP_CLIENT
+    litellm.aclient_session = HTTP_ASYNC_CLIENT
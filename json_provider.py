@@ -0,0 +1,25 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, for Flask and Quart apps.
+
+    Keeps the default provider's key sorting and the replaced provider's
+    fallback encoder (so QuartSchema's pydantic support still works when this
+    is installed after it); non-string keys (e.g. HTTP status codes in OpenAPI
+    specs) are stringified as the stdlib encoder does.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.default = app.json.default
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import json
+import threading
+
+import numpy as np
+from cachetools import TTLCache
+from openai import OpenAI
+
+from http_clients import HTTP_CLIENT
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case and collapse whitespace so trivially different queries share a key"""
+    return " ".join(query.lower().split())
+
+
+class LLMCache:
+    """Two-tier response cache checked before running an LLM pipeline.
+
+    Tier 1 is an exact match on the SHA-256 of the normalized query.
+    Tier 2 embeds the query and returns the closest cached answer when its
+    cosine similarity is at least ``threshold``. Entries expire after ``ttl``
+    seconds since the pipelines run at a non-zero temperature.
+
+    An optional ``context`` string (e.g. the course data fed to the prompt)
+    scopes entries: both tiers only return answers stored with the same one.
+    """
+
+    def __init__(self, model, ttl=3600, maxsize=1024, threshold=0.95,
+                 embedding_model="text-embedding-3-small"):
+        self.model = model
+        self.threshold = threshold
+        self.embedding_model = embedding_model
+        self._responses = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._keys = []        # cache key for each row of _matrix
+        self._contexts = []    # context digest for each row of _matrix
+        self._matrix = None    # unit-norm embeddings of cached queries
+        self._lock = threading.Lock()
+        self._client = None
+        self._stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+
+    def stats(self):
+        """Return a snapshot of the hit/miss counters"""
+        with self._lock:
+            return dict(self._stats)
+
+    @staticmethod
+    def _digest(text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def key(self, query, context=None):
+        fields = {"q": normalize_query(query), "model": self.model}
+        if context is not None:
+            fields["context"] = self._digest(context)
+        return self._digest(json.dumps(fields, sort_keys=True))
+
+    def _embed(self, query):
+        try:
+            if self._client is None:
+                self._client = OpenAI(http_client=HTTP_CLIENT)
+            result = self._client.embeddings.create(model=self.embedding_model, input=query)
+        except Exception:
+            # Semantic lookup is best-effort; fall back to exact matching only
+            return None
+        vector = np.asarray(result.data[0].embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def lookup(self, query, context=None):
+        """Return (response, embedding); response is None on a miss.
+
+        The embedding is computed only on an exact miss and should be handed
+        back to store() so the query is not embedded twice.
+        """
+        key = self.key(query, context)
+        with self._lock:
+            response = self._responses.get(key)
+            if response is not None:
+                self._stats["exact_hits"] += 1
+                return response, None
+
+        embedding = self._embed(query)
+        if embedding is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None, None
+
+        with self._lock:
+            if self._matrix is not None:
+                scores = self._matrix @ embedding
+                # Only rows stored under the caller's context (None included) may match
+                digest = self._digest(context) if context is not None else None
+                scores[np.array([c != digest for c in self._contexts])] = -1.0
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    response = self._responses.get(self._keys[best])
+            self._stats["semantic_hits" if response is not None else "misses"] += 1
+        return response, embedding
+
+    def store(self, query, response, embedding=None, context=None):
+        key = self.key(query, context)
+        with self._lock:
+            self._responses[key] = response
+            if embedding is None:
+                return
+
+            # Drop rows whose response has expired or been evicted
+            live = [i for i, k in enumerate(self._keys) if k != key and k in self._responses]
+            self._keys = [self._keys[i] for i in live] + [key]
+            self._contexts = [self._contexts[i] for i in live] + [
+                self._digest(context) if context is not None else None
+            ]
+            rows = [self._matrix[live]] if self._matrix is not None else []
+            self._matrix = np.vstack(rows + [embedding[None, :]])
+
+
+class SingleFlight:
+    """Collapse concurrent identical async calls into one in-flight call.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task. Each caller awaits through shield()
+    so one client disconnecting does not cancel the work for the others.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+
+    async def run(self, key, make_coro):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(make_coro())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
@@ -1,54 +1,134 @@
 import os
+import re
 import json
+import asyncio
+import ahocorasick
+import orjson
+import lxml.html
 import requests
+import threading
 import traceback
+from datetime import datetime
 
-from flasgger import Swagger
-from flask import Flask, request, jsonify
-from bs4 import BeautifulSoup
+from apscheduler.schedulers.background import BackgroundScheduler
+from rank_bm25 import BM25Okapi
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from quart import Quart, Response, request, jsonify
+from quart_schema import QuartSchema, document_request, document_response, tag
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from crewai import Agent, Task, Crew, CrewOutput
+from crewai import Agent, Task, TaskOutput
+from crewai.utilities.formatter import aggregate_raw_outputs_from_tasks
 from langchain_openai import ChatOpenAI
+from llm_cache import LLMCache
+from json_provider import ORJSONProvider
+from http_clients import HTTP_CLIENT, HTTP_ASYNC_CLIENT, share_with_litellm
 
 # Load environment variables
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Setup Flask app
-app = Flask(__name__)
-swagger = Swagger(app)
+# Share one pooled HTTP client across all OpenAI calls
+share_with_litellm()
+
+# Setup Quart app (OpenAPI docs served at /docs)
+app = Quart(__name__)
+schema = QuartSchema(app)
+# Installed after QuartSchema, which sets its own provider in init_app
+app.json = ORJSONProvider(app)
 
 # ========== Website Scraper ==========
-def get_website_data():
+# Pooled HTTP session so repeated fetches reuse the TLS connection
+_SESSION = requests.Session()
+_SESSION.headers.update({'User-Agent': 'Mozilla/5.0'})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+
+_CONTENT_TAGS = ('p', 'li', 'h1', 'h2', 'h3')  # no 'div': it repeats its children's text
+_MAX_WEBSITE_LINES = 50
+_WEBSITE_REFRESH_MINUTES = 9  # how often the background prefetcher re-scrapes
+
+def scrape_website():
+    url = "https://www.skillcapital.ai"
+    response = _SESSION.get(url, timeout=10)
+    response.raise_for_status()
+    tree = lxml.html.fromstring(response.content)
+
+    data = []
+    title = tree.find('.//title')
+    if title is not None:
+        data.append(f"Website Title: {title.text_content().strip()}")
+
+    desc = tree.find('.//meta[@name="description"]')
+    if desc is not None:
+        data.append(f"Description: {desc.get('content', '').strip()}")
+
+    main = tree.find('.//main')
+    if main is None:
+        main = tree.find('.//body')
+    if main is not None:
+        for element in main.iter(*_CONTENT_TAGS):
+            if len(data) >= _MAX_WEBSITE_LINES:
+                break
+            text = element.text_content().strip()
+            if len(text) > 20:
+                data.append(text)
+
+    return "\n".join(data)
+
+# Last good scrape, kept fresh by the background prefetcher; failures never
+# replace it
+_WEBSITE_CACHE = {"site": None, "attempts": 0}
+_WEBSITE_LOCK = threading.Lock()
+_SCRAPE_LOCK = threading.Lock()  # only one scrape runs at a time
+
+def _scrape_into_cache():
     try:
-        url = "https://www.skillcapital.ai"
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        data = []
-        title = soup.find('title')
-        if title:
-            data.append(f"Website Title: {title.get_text().strip()}")
-
-        desc = soup.find('meta', attrs={'name': 'description'})
-        if desc:
-            data.append(f"Description: {desc.get('content', '').strip()}")
-
-        main = soup.find('main') or soup.find('body')
-        if main:
-            for tag in main.find_all(['p', 'li', 'div', 'h1', 'h2', 'h3']):
-                text = tag.get_text().strip()
-                if text and len(text) > 20:
-                    data.append(text)
-
-        return "\n".join(data[:50])
-    except Exception:
-        return "No website data available."
+        site = scrape_website()
+    except Exception as e:
+        print(f"❌ Website refresh failed: {e}")
+        site = None
+    with _WEBSITE_LOCK:
+        _WEBSITE_CACHE["attempts"] += 1
+        if site is not None:
+            _WEBSITE_CACHE["site"] = site
+
+def refresh_website_cache():
+    with _SCRAPE_LOCK:
+        _scrape_into_cache()
+
+def get_website_data():
+    # Any copy is served, however old; refreshing it is the prefetcher's job,
+    # so requests never wait on the site while a copy exists
+    with _WEBSITE_LOCK:
+        site, attempts = _WEBSITE_CACHE["site"], _WEBSITE_CACHE["attempts"]
+    if site is None:
+        # Nothing scraped yet, so scrape inline. Requests that queued behind
+        # another scrape take its outcome instead of starting their own
+        with _SCRAPE_LOCK:
+            with _WEBSITE_LOCK:
+                attempted = _WEBSITE_CACHE["attempts"] != attempts
+            if not attempted:
+                _scrape_into_cache()
+        with _WEBSITE_LOCK:
+            site = _WEBSITE_CACHE["site"]
+    return site if site is not None else "No website data available."
+
+def start_prefetcher():
+    """Scrape the homepage now and every few minutes on a background thread"""
+    scheduler = BackgroundScheduler(daemon=True)
+    scheduler.add_job(refresh_website_cache, "interval", minutes=_WEBSITE_REFRESH_MINUTES,
+                      next_run_time=datetime.now())
+    scheduler.start()
+    return scheduler
 
 # ========== Curriculum Loader ==========
-def load_course_curriculum():
+def _read_course_curriculum():
     try:
         curriculum_path = os.path.join(os.path.dirname(__file__), 'course_curriculum.json')
         with open(curriculum_path, 'r', encoding='utf-8') as f:
@@ -59,98 +139,156 @@ def load_course_curriculum():
         print(f"❌ Failed to load curriculum: {e}")
         return {}
 
+def _course_list(curriculum_data):
+    if isinstance(curriculum_data, dict) and "courses" in curriculum_data:
+        raw_courses = curriculum_data["courses"]
+        if isinstance(raw_courses, dict):
+            return list(raw_courses.values())
+        elif isinstance(raw_courses, list):
+            return raw_courses
+    return []
+
+# The curriculum file is static, so read and index it once at import
+_CURRICULUM = _read_course_curriculum()
+_COURSES_LIST = _course_list(_CURRICULUM)
+_COURSE_NAME_INDEX = {
+    c["name"].lower(): c for c in _COURSES_LIST if isinstance(c, dict) and c.get("name")
+}
+
+# One automaton over every course name finds all mentions in a single pass;
+# each name maps to its catalog position so matches keep catalog order
+_COURSE_AUTOMATON = ahocorasick.Automaton()
+for _position, _name in enumerate(_COURSE_NAME_INDEX):
+    _COURSE_AUTOMATON.add_word(_name, _position)
+_COURSE_AUTOMATON.make_automaton()
+_INDEXED_COURSES = list(_COURSE_NAME_INDEX.values())
+
+# Without an explicit name mention, only the top-K courses by BM25 over name and
+# description go into the prompt instead of the whole catalog
+_FALLBACK_COURSES = 5
+_TOKEN_RE = re.compile(r"\w+")
+
+def _tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+_COURSE_BM25 = BM25Okapi([
+    _tokenize(f"{c['name']} {c.get('description', '')}") for c in _INDEXED_COURSES
+]) if _INDEXED_COURSES else None
+
+def load_course_curriculum():
+    return _CURRICULUM
+
 # ========== LLM Setup ==========
 llm = ChatOpenAI(model="gpt-4", temperature=0.4, api_key=OPENAI_API_KEY)
 
+# Pricing and summarizing only restate given facts, so they use a smaller, faster model
+SUMMARIZER_MODEL = os.getenv("SUMMARIZER_MODEL", "gpt-4o-mini")
+llm_mini = ChatOpenAI(model=SUMMARIZER_MODEL, temperature=0.4, api_key=OPENAI_API_KEY)
+
+# Crew responses cached per question (exact + semantic) and matched courses
+response_cache = LLMCache(model=llm.model_name, threshold=0.92)
+
 # ========== Agents ==========
-course_expert = Agent(
-    role="Course Expert",
-    goal="Provide clear and structured answers about SkillCapital's course content and structure",
-    backstory="Expert in educational program design and technical upskilling paths",
-    verbose=True,
-    llm=llm
-)
-
-pricing_assistant = Agent(
-    role="Pricing Assistant",
-    goal="Help users understand SkillCapital's pricing, value, and affordability",
-    backstory="Specialist in explaining course pricing models and offers in detail",
-    verbose=True,
-    llm=llm
-)
-
-summary_generator = Agent(
-    role="Summary Generator",
-    goal="Generate a final natural-language response combining course and pricing responses",
-    backstory="Expert in user communication and formatting answers for conversational delivery",
-    verbose=True,
-    llm=llm
-)
+# Built per request: an agent keeps its executor (and that run's messages)
+# on itself, so agents shared between requests could mix users' prompts
+def build_agents():
+    course_expert = Agent(
+        role="Course Expert",
+        goal="Provide clear and structured answers about SkillCapital's course content and structure",
+        backstory="Expert in educational program design and technical upskilling paths",
+        verbose=True,
+        llm=llm
+    )
+
+    pricing_assistant = Agent(
+        role="Pricing Assistant",
+        goal="Help users understand SkillCapital's pricing, value, and affordability",
+        backstory="Specialist in explaining course pricing models and offers in detail",
+        verbose=True,
+        llm=llm_mini
+    )
+
+    summary_generator = Agent(
+        role="Summary Generator",
+        goal="Generate a final natural-language response combining course and pricing responses",
+        backstory="Expert in user communication and formatting answers for conversational delivery",
+        verbose=True,
+        llm=llm_mini
+    )
+
+    return course_expert, pricing_assistant, summary_generator
 
 # ========== Task Builder ==========
-def get_tasks(user_question: str, context: str, matched_courses):
-    courses_str = json.dumps(matched_courses, indent=2)
+# Fixed instructions come first and per-request text last, so every prompt
+# shares a byte-identical prefix that OpenAI's prompt caching can reuse. The
+# scraped context changes less often than the question, so it goes before it.
+_COURSE_PREFIX = "You are the Course Expert. Use the context below to answer the user's question with course insights."
+_PRICING_PREFIX = ("You are the Pricing Assistant. Use the context below to explain pricing or payment plans "
+                   "for the user's question, or say 'No pricing info needed.' if irrelevant.")
+_SUMMARY_PREFIX = ("You are the Summary Generator. Combine the answers from Course Expert and Pricing Assistant "
+                   "to create a final response. Ensure the response is warm, friendly, and includes both course "
+                   "and pricing insights for the user's question.")
+
+def get_tasks(user_question: str, context: str):
+    course_expert, pricing_assistant, summary_generator = build_agents()
+
+    # Course and pricing answers are independent, so they run concurrently;
+    # the summary is handed both through its context
+    course_task = Task(
+        description=f"{_COURSE_PREFIX}\n\nContext:\n{context}\n\nUser question: {user_question}",
+        agent=course_expert,
+        expected_output="Explain course content, modules, duration, and outcomes."
+    )
+    pricing_task = Task(
+        description=f"{_PRICING_PREFIX}\n\nContext:\n{context}\n\nUser question: {user_question}",
+        agent=pricing_assistant,
+        expected_output="Give clear pricing, offers, or respond 'not requested'."
+    )
 
     return [
+        course_task,
+        pricing_task,
         Task(
-            description=f"""You are the Course Expert. A user asked: '{user_question}'.
-Use this context to answer with course insights:
-{context}""",
-            agent=course_expert,
-            expected_output="Explain course content, modules, duration, and outcomes."
-        ),
-        Task(
-            description=f"""You are the Pricing Assistant. A user asked: '{user_question}'.
-Use this context to explain pricing, payment plans, or say 'No pricing info needed.' if irrelevant:
-{context}""",
-            agent=pricing_assistant,
-            expected_output="Give clear pricing, offers, or respond 'not requested'."
-        ),
-        Task(
-            description=f"""You are the Summary Generator. Combine the answers from Course Expert and Pricing Assistant to create a final response.
-
-Use this course data:
-{courses_str}
-
-Ensure the response is warm, friendly, and includes both course and pricing insights for: "{user_question}".""",
+            description=f"{_SUMMARY_PREFIX}\n\nUser question: {user_question}",
             agent=summary_generator,
-            expected_output="Single final summary combining course + pricing info."
+            expected_output="Single final summary combining course + pricing info.",
+            context=[course_task, pricing_task]
         )
     ]
 
 # ========== Response Formatter ==========
 def summarize_response(user_question, matched_courses, tasks):
-    cleaned_courses = []
-    for i, c in enumerate(matched_courses):
-        if isinstance(c, dict):
-            cleaned_courses.append({
-                "name": c.get("name", "N/A"),
-                "duration": c.get("duration", "N/A"),
-                "modules": c.get("modules", "N/A"),
-                "outcome": c.get("outcome", "N/A")
-            })
+    cleaned_courses = [
+        {key: c.get(key, "N/A") for key in ("name", "duration", "modules", "outcome")}
+        for c in matched_courses if isinstance(c, dict)
+    ]
+    course_out, pricing_out, summary_out = (str(t.output) if t.output else None for t in tasks)
+
+    def answer(output, missing):
+        return output if output is not None else missing
 
     return {
         "title": "🎓 SkillCapital Smart Assistant",
         "question": user_question,
         "matched_courses": cleaned_courses,
         "agents": [
-            {"agent": "Course Expert", "response": str(tasks[0].output) if tasks[0].output else "No course expert output."},
-            {"agent": "Pricing Assistant", "response": str(tasks[1].output) if tasks[1].output else "No pricing output."},
-            {"agent": "Summary Generator", "response": str(tasks[2].output) if tasks[2].output else "No summary output."}
+            {"agent": "Course Expert", "response": answer(course_out, "No course expert output.")},
+            {"agent": "Pricing Assistant", "response": answer(pricing_out, "No pricing output.")},
+            {"agent": "Summary Generator", "response": answer(summary_out, "No summary output.")}
         ],
-        "final_summary": str(tasks[2].output) if tasks[2].output else "Summary not available."
+        "final_summary": answer(summary_out, "Summary not available.")
     }
 
 # ========== Crew Runner ==========
-def run_chatbot_crew(user_input: str, context_data: str, matched_courses):
-    tasks = get_tasks(user_input, context_data, matched_courses)
-    crew = Crew(
-        agents=[task.agent for task in tasks],
-        tasks=tasks,
-        verbose=False
-    )
-    result: CrewOutput = crew.kickoff()
+async def run_chatbot_crew(user_input: str, context_data: str, matched_courses):
+    tasks = get_tasks(user_input, context_data)
+    producers, summary_task = tasks[:2], tasks[2]
+
+    # Each producer gets its own worker thread. A crew async task would hang
+    # the request if it raised, since its future is never given the exception
+    await asyncio.gather(*(asyncio.to_thread(task.execute_sync) for task in producers))
+    await asyncio.to_thread(summary_task.execute_sync,
+                            context=aggregate_raw_outputs_from_tasks(summary_task.context))
 
     # Optional debug
     print("\n✅ Agent Outputs:")
@@ -159,78 +297,136 @@ def run_chatbot_crew(user_input: str, context_data: str, matched_courses):
 
     return summarize_response(user_input, matched_courses, tasks)
 
+# ========== Streaming Crew Runner ==========
+# The final stage is called directly with streaming on, so the summary can be
+# sent token by token instead of after the whole crew finishes
+summary_llm_streaming = ChatOpenAI(model=SUMMARIZER_MODEL, temperature=0.4, api_key=OPENAI_API_KEY,
+                                   streaming=True, http_client=HTTP_CLIENT,
+                                   http_async_client=HTTP_ASYNC_CLIENT)
+
+def summary_prompt(summary_task, producer_tasks):
+    answers = "\n\n".join(f"{task.agent.role}:\n{task.output}" for task in producer_tasks)
+    return f"""{summary_task.description}
+
+Expected output: {summary_task.expected_output}
+
+Answers to combine:
+{answers}"""
+
+async def stream_chatbot_crew(user_input: str, context_data: str, matched_courses):
+    """Yield ("delta", text) for each summary chunk, then ("done", response)"""
+    tasks = get_tasks(user_input, context_data)
+    producers, summary_task = tasks[:2], tasks[2]
+
+    # Run the independent course and pricing tasks side by side
+    await asyncio.gather(*(asyncio.to_thread(task.execute_sync) for task in producers))
+
+    chunks = []
+    async for chunk in summary_llm_streaming.astream(summary_prompt(summary_task, producers)):
+        if chunk.content:
+            chunks.append(chunk.content)
+            yield "delta", chunk.content
+
+    summary_task.output = TaskOutput(
+        description=summary_task.description, raw="".join(chunks), agent=summary_task.agent.role
+    )
+    yield "done", summarize_response(user_input, matched_courses, tasks)
+
 # ========== Match Relevant Courses ==========
-def find_relevant_courses(question, curriculum_data):
-    matched = []
-    q = question.lower()
+def find_relevant_courses(question):
+    if not _INDEXED_COURSES:
+        return _COURSES_LIST
+    positions = sorted({position for _, position in _COURSE_AUTOMATON.iter(question.lower())})
+    if positions:
+        return [_INDEXED_COURSES[position] for position in positions]
+
+    # Best scores first; ties (e.g. no overlap at all) keep catalog order
+    scores = _COURSE_BM25.get_scores(_tokenize(question))
+    ranked = sorted(range(len(_INDEXED_COURSES)), key=lambda position: -scores[position])
+    return [_INDEXED_COURSES[position] for position in ranked[:_FALLBACK_COURSES]]
+
+# ========== Quart API ==========
+def build_context(user_input):
+    """Return (matched_courses, matched_courses_json, prompt context) for a question"""
+    website_info = get_website_data()
+    matched_courses = find_relevant_courses(user_input)
+
+    # Serialized once (compact; the LLM ignores whitespace) for the prompt and cache key
+    curriculum_text = orjson.dumps(matched_courses).decode("utf-8")
+    context = f"{website_info}\n\nRelevant Courses:\n{curriculum_text}"
+    return matched_courses, curriculum_text, context
+
+# Greetings and acknowledgements get a canned reply without scraping or any LLM call
+_TRIVIAL = re.compile(r'^\s*(hi|hello|hey|thanks|thank you|ok|bye)[\s!.?]*$', re.IGNORECASE)
+TRIVIAL_REPLY = "Hi! Ask me about SkillCapital courses or pricing."
+
+def trivial_response(user_input):
+    return {
+        "title": "🎓 SkillCapital Smart Assistant",
+        "question": user_input,
+        "matched_courses": [],
+        "agents": [],
+        "final_summary": TRIVIAL_REPLY
+    }
 
-    courses = []
-    if isinstance(curriculum_data, dict) and "courses" in curriculum_data:
-        raw_courses = curriculum_data["courses"]
-        if isinstance(raw_courses, dict):
-            courses = list(raw_courses.values())
-        elif isinstance(raw_courses, list):
-            courses = raw_courses
+def sse_event(event, data):
+    return f"event: {event}\ndata: {orjson.dumps(data).decode('utf-8')}\n\n"
+
+# Request / response schemas for the OpenAPI docs
+class ChatRequest(BaseModel):
+    message: str = Field(examples=["I'm looking for courses on data science"],
+                         description="User's query or message to the chatbot")
+
+class CourseSummary(BaseModel):
+    name: str
+    duration: str
+    modules: object
+    outcome: object
 
-    for course in courses:
-        if isinstance(course, dict):
-            name = course.get("name", "").lower()
-            if name and name in q:
-                matched.append(course)
+class AgentAnswer(BaseModel):
+    agent: str
+    response: str
 
-    return matched if matched else courses
+class SmartChatResponse(BaseModel):
+    title: str
+    question: str
+    matched_courses: list[CourseSummary]
+    agents: list[AgentAnswer]
+    final_summary: str
+
+class ErrorResponse(BaseModel):
+    error: str
+
+class PingResponse(BaseModel):
+    status: str = Field(examples=["✅ SkillCapital AI Assistant is running."])
+    cache: dict[str, int] = Field(description="Response cache exact_hits, semantic_hits and misses")
 
-# ========== Flask API ==========
 @app.route('/smart-chatbot', methods=['POST'])
-def smart_chatbot():
-    """
-    Smart Chatbot API
-    ---
-    post:
-      summary: Get intelligent chatbot response based on user input and course curriculum
-      description: >
-        This endpoint receives a user message, analyzes it using website data and curriculum context,
-        and returns a contextual chatbot response using CrewAI or similar backend service.
-      requestBody:
-        required: true
-        content:
-          application/json:
-            schema:
-              type: object
-              properties:
-                message:
-                  type: string
-                  example: "I'm looking for courses on data science"
-                  description: User's query or message to the chatbot
-      responses:
-        200:
-          description: Chatbot response based on context and user message
-          content:
-            application/json:
-              schema:
-                type: object
-                properties:
-                  response:
-                    type: string
-                    example: "Based on your interest, you may like our Data Science Bootcamp..."
-        400:
-          description: Bad request - message is missing
-        500:
-          description: Internal server error
-    """
+@tag(['Chatbot'])
+@document_request(ChatRequest)
+@document_response(SmartChatResponse)
+@document_response(ErrorResponse, 400)
+@document_response(ErrorResponse, 500)
+async def smart_chatbot():
+    """Answer a question about SkillCapital courses using website data and the curriculum"""
     try:
-        user_input = request.json.get("message", "")
-        if not user_input:
+        # Missing, non-JSON and non-object bodies all get the 400 below
+        data = await request.get_json(silent=True) or {}
+        user_input = data.get("message", "") if isinstance(data, dict) else ""
+        if not user_input or not isinstance(user_input, str):
             return jsonify({"error": "Message is required"}), 400
+        if _TRIVIAL.match(user_input):
+            return jsonify(trivial_response(user_input))
 
-        website_info = get_website_data()
-        curriculum_data = load_course_curriculum()
-        matched_courses = find_relevant_courses(user_input, curriculum_data)
+        # Scraping (on a cold cache) and embedding block, so keep them off the event loop
+        matched_courses, curriculum_text, context = await asyncio.to_thread(build_context, user_input)
 
-        curriculum_text = json.dumps(matched_courses, indent=2)
-        context = f"{website_info}\n\nRelevant Courses:\n{curriculum_text}"
+        cached, embedding = await asyncio.to_thread(response_cache.lookup, user_input, curriculum_text)
+        if cached is not None:
+            return jsonify({**cached, "question": user_input})
 
-        response = run_chatbot_crew(user_input, context, matched_courses)
+        response = await run_chatbot_crew(user_input, context, matched_courses)
+        response_cache.store(user_input, response, embedding, context=curriculum_text)
         return jsonify(response)
 
     except Exception as e:
@@ -239,29 +435,72 @@ def smart_chatbot():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/smart-chatbot/stream', methods=['POST'])
+@tag(['Chatbot'])
+@document_request(ChatRequest)
+@document_response(ErrorResponse, 400)
+async def smart_chatbot_stream():
+    """Stream the final summary as Server-Sent Events.
+
+    Emits "delta" events with JSON-encoded summary text as it is generated, then
+    one "done" event carrying the full /smart-chatbot response, or an "error"
+    event if the crew fails.
+    """
+    # Missing, non-JSON and non-object bodies all get the 400 below
+    data = await request.get_json(silent=True) or {}
+    user_input = data.get("message", "") if isinstance(data, dict) else ""
+    if not user_input or not isinstance(user_input, str):
+        return jsonify({"error": "Message is required"}), 400
+
+    async def events():
+        if _TRIVIAL.match(user_input):
+            yield sse_event("delta", TRIVIAL_REPLY)
+            yield sse_event("done", trivial_response(user_input))
+            return
+        try:
+            matched_courses, curriculum_text, context = await asyncio.to_thread(build_context, user_input)
+            cached, embedding = await asyncio.to_thread(response_cache.lookup, user_input, curriculum_text)
+            if cached is not None:
+                response = {**cached, "question": user_input}
+                yield sse_event("delta", response["final_summary"])
+                yield sse_event("done", response)
+                return
+
+            async for event, payload in stream_chatbot_crew(user_input, context, matched_courses):
+                if event == "done":
+                    response_cache.store(user_input, payload, embedding, context=curriculum_text)
+                yield sse_event(event, payload)
+        except Exception as e:
+            print("❌ Error in /smart-chatbot/stream:")
+            traceback.print_exc()
+            yield sse_event("error", {"error": str(e)})
+
+    response = Response(events(), mimetype="text/event-stream")
+    response.timeout = None  # a crew run can outlast Quart's default response timeout
+    return response
+
+
 # ========== Health Check ==========
 @app.route('/ping', methods=['GET'])
-def ping():
-    """
-    Health Check
-    ---
-    get:
-      summary: Check if the chatbot service is running
-      description: Returns a simple status message to confirm the API is alive.
-      responses:
-        200:
-          description: Service is running
-          content:
-            application/json:
-              schema:
-                type: object
-                properties:
-                  status:
-                    type: string
-                    example: ✅ SkillCapital AI Assistant is running.
-    """
-    return jsonify({"status": "✅ SkillCapital AI Assistant is running."})
+@tag(['Health'])
+@document_response(PingResponse)
+async def ping():
+    """Check if the chatbot service is running"""
+    return jsonify({"status": "✅ SkillCapital AI Assistant is running.", "cache": response_cache.stats()})
+
+# ========== Background Jobs ==========
+@app.before_serving
+async def start_background_jobs():
+    # Each serving process keeps its own copy of the homepage warm
+    app.scheduler = start_prefetcher()
+
+@app.after_serving
+async def stop_background_jobs():
+    app.scheduler.shutdown(wait=False)
+
 # ========== Main ==========
+# Production: hypercorn skillcapital_chatbot_api:app --bind 0.0.0.0:$PORT --workers 2 --worker-class asyncio
+# app.run() is only a local-development fallback
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
 
@@ -0,0 +1,212 @@
+# SkillCapital intent answers
+# Keyword routing and canned answers shared by chatbot.py, app.py and bot.py.
+# Importing this module has no side effects beyond reading course_curriculum.json.
+
+import os
+import re
+import orjson
+import ahocorasick
+
+# Load course curriculum data
+def _read_course_curriculum():
+    """Read course curriculum from JSON file"""
+    try:
+        # Get the path to the curriculum file
+        current_dir = os.path.dirname(__file__)
+        curriculum_path = os.path.join(current_dir, 'course_curriculum.json')
+        
+        with open(curriculum_path, 'rb') as file:
+            return orjson.loads(file.read())
+    except Exception as e:
+        return None
+
+# The curriculum file is static, so read it once at import
+_CURRICULUM = _read_course_curriculum()
+
+def load_course_curriculum():
+    """Return the course curriculum loaded at import"""
+    return _CURRICULUM
+
+# Common spelling mistakes and variations
+_CORRECTIONS = {
+    'curriculam': 'curriculum',
+    'trainning': 'training',
+    'enrolment': 'enrollment',
+    'skill capital': 'skillcapital',
+    'skill-capital': 'skillcapital',
+    'skill_capital': 'skillcapital',
+    'how much': 'price',
+    'costs': 'cost',
+    'fees': 'fee',
+    'hours': 'duration',
+    'time': 'duration',
+    'how long': 'duration',
+    'sign up': 'enroll',
+    'join': 'enroll',
+    'i want enroll': 'enroll',
+    'i want to enroll': 'enroll',
+    'how to enroll': 'enroll'
+}
+# Longest keys first so e.g. 'i want to enroll' wins over any shorter overlapping key
+_CORRECTIONS_RE = re.compile("|".join(map(re.escape, sorted(_CORRECTIONS, key=len, reverse=True))))
+
+# Handle common spelling mistakes and variations
+def normalize_input(user_input):
+    """Normalize user input to handle spelling mistakes and variations"""
+    return _CORRECTIONS_RE.sub(lambda match: _CORRECTIONS[match.group(0)], user_input.lower())
+
+# Keywords that route a question to each answer category
+_KEYWORD_CATEGORIES = {
+    'skillcapital': [
+        'skillcapital', 'skill capital', 'skill-capital', 'skill_capital',
+        'course', 'courses', 'curriculum', 'curriculam',
+        'learn', 'learning', 'training', 'trainning',
+        'enroll', 'enrollment', 'enrolment', 'register', 'registration', 'sign up', 'join',
+        'price', 'pricing', 'cost', 'costs', 'fee', 'fees',
+        'duration', 'time', 'hours', 'how long',
+        'python', 'cloud', 'devops', 'ai', 'machine learning',
+        'programming', 'coding', 'development'
+    ],
+    'curriculum': ['content', 'curriculum', 'curriculam', 'modules', 'syllabus', 'topics'],
+    'python': ['python'],
+    'cloud': ['cloud'],
+    'devops': ['devops'],
+    'ai_ml': ['ai', 'machine learning'],
+    'price': ['price', 'cost', 'fee', 'how much'],
+    'duration': ['duration', 'time', 'hours', 'how long'],
+    'enroll': ['enroll', 'enrollment', 'join', 'register', 'sign up'],
+    'course': ['course', 'learn', 'training']
+}
+
+# Compile every keyword into one automaton so a single pass finds all categories
+_KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for _keyword in {kw for keywords in _KEYWORD_CATEGORIES.values() for kw in keywords}:
+    _KEYWORD_AUTOMATON.add_word(_keyword, (len(_keyword), frozenset(
+        category for category, keywords in _KEYWORD_CATEGORIES.items() if _keyword in keywords
+    )))
+_KEYWORD_AUTOMATON.make_automaton()
+
+# What may follow a keyword inside the same word: a simple plural or -ing
+_KEYWORD_SUFFIX_RE = re.compile(r"(?:s|es|ing)?\b")
+
+def match_categories(text):
+    """Return the set of keyword categories whose keywords appear as words in text"""
+    categories = set()
+    for end, (length, keyword_categories) in _KEYWORD_AUTOMATON.iter(text):
+        # Keywords must be whole words ('ai' not in 'said' or 'aim', 'cost'
+        # not in 'costume'), allowing a suffix so 'prices' and 'trainings' count
+        start = end - length + 1
+        if start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+            continue
+        if _KEYWORD_SUFFIX_RE.match(text, end + 1):
+            categories.update(keyword_categories)
+    return categories
+
+# The brand itself, after normalize_input() has folded 'skill capital' and friends
+_BRAND_RE = re.compile(r"\bskillcapital\b")
+
+def mentions_skillcapital(normalized_input):
+    """Return True when text names SkillCapital itself, not just a course topic"""
+    return _BRAND_RE.search(normalized_input) is not None
+
+# Answers that do not resolve a specific SkillCapital intent
+SKILLCAPITAL_LINK_ANSWER = "skillcapital.ai"
+GENERAL_QUESTION_ANSWER = "I'm here to help with SkillCapital information! For general questions, I can assist you. What would you like to know about our courses, pricing, or enrollment process?"
+FALLBACK_ANSWER = "I'm here to help! For SkillCapital questions, visit skillcapital.ai. For other questions, I can assist you with general information."
+
+# Smart answer generation
+def get_smart_answer(normalized_input):
+    """Get smart answer using curriculum data.
+
+    Expects text already passed through normalize_input().
+    """
+    try:
+        # Load curriculum data
+        curriculum_data = load_course_curriculum()
+        
+        # Find every keyword category in a single pass
+        categories = match_categories(normalized_input)
+        
+        if 'skillcapital' in categories:
+            # Handle course content/curriculum questions
+            if 'curriculum' in categories:
+                # Check for specific course
+                if 'python' in categories:
+                    if curriculum_data and 'courses' in curriculum_data and 'python' in curriculum_data['courses']:
+                        course = curriculum_data['courses']['python']
+                        modules_info = []
+                        for module in course['curriculum']:
+                            modules_info.append(f"📚 {module['module']} ({module['duration']})")
+                            for topic in module['topics']:
+                                modules_info.append(f"  • {topic}")
+                        return f"Python Programming Course Modules:\n" + "\n".join(modules_info)
+                    else:
+                        return "Python Programming: Python Fundamentals, Data Structures, OOP, File Handling, Advanced Python, Practical Projects"
+                
+                elif 'cloud' in categories:
+                    if curriculum_data and 'courses' in curriculum_data and 'cloud_computing' in curriculum_data['courses']:
+                        course = curriculum_data['courses']['cloud_computing']
+                        modules_info = []
+                        for module in course['curriculum']:
+                            modules_info.append(f"📚 {module['module']} ({module['duration']})")
+                            for topic in module['topics']:
+                                modules_info.append(f"  • {topic}")
+                        return f"Cloud Computing Course Modules:\n" + "\n".join(modules_info)
+                    else:
+                        return "Cloud Computing: Cloud Fundamentals, AWS Services, Azure Services, GCP, DevOps in Cloud"
+                
+                elif 'devops' in categories:
+                    if curriculum_data and 'courses' in curriculum_data and 'devops' in curriculum_data['courses']:
+                        course = curriculum_data['courses']['devops']
+                        modules_info = []
+                        for module in course['curriculum']:
+                            modules_info.append(f"📚 {module['module']} ({module['duration']})")
+                            for topic in module['topics']:
+                                modules_info.append(f"  • {topic}")
+                        return f"DevOps Engineering Course Modules:\n" + "\n".join(modules_info)
+                    else:
+                        return "DevOps Engineering: DevOps Fundamentals, CI/CD, Containerization, Orchestration, Infrastructure as Code, Monitoring"
+                
+                elif 'ai_ml' in categories:
+                    if curriculum_data and 'courses' in curriculum_data and 'ai_ml' in curriculum_data['courses']:
+                        course = curriculum_data['courses']['ai_ml']
+                        modules_info = []
+                        for module in course['curriculum']:
+                            modules_info.append(f"📚 {module['module']} ({module['duration']})")
+                            for topic in module['topics']:
+                                modules_info.append(f"  • {topic}")
+                        return f"AI and Machine Learning Course Modules:\n" + "\n".join(modules_info)
+                    else:
+                        return "AI and Machine Learning: AI Fundamentals, Supervised Learning, Unsupervised Learning, Deep Learning, AI Tools"
+                
+                else:
+                    # General curriculum overview
+                    if curriculum_data and 'courses' in curriculum_data:
+                        courses_info = []
+                        for course_key, course in curriculum_data['courses'].items():
+                            modules = [module['module'] for module in course['curriculum']]
+                            courses_info.append(f"📚 {course['name']}: {', '.join(modules)}")
+                        return "Available Courses and Modules:\n" + "\n".join(courses_info)
+                    else:
+                        return "Python: 6 modules, Cloud: 5 modules, DevOps: 6 modules, AI/ML: 5 modules"
+            
+            # Handle other SkillCapital questions
+            elif 'price' in categories:
+                return "999/-"
+            elif 'duration' in categories:
+                return "30 hours"
+            elif 'enroll' in categories:
+                return "https://www.skillcapital.ai"
+            elif 'python' in categories:
+                return "999/-"
+            elif 'course' in categories:
+                return "Python, Cloud, DevOps"
+            else:
+                return SKILLCAPITAL_LINK_ANSWER
+        else:
+            # Handle general questions
+            return GENERAL_QUESTION_ANSWER
+        
+    except Exception as e:
+        # Fallback response
+        return FALLBACK_ANSWER